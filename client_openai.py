@@ -1,23 +1,68 @@
 import asyncio
 import platform
-import json
-from typing import Optional
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Optional
 from contextlib import AsyncExitStack
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from mcp.types import CallToolResult, TextContent
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 import os
+from importlib.util import find_spec
 
-load_dotenv()
+try:
+    import orjson
+    from orjson import loads
+
+    def canonical_args(args: dict) -> bytes:
+        return orjson.dumps(args, option=orjson.OPT_SORT_KEYS)
+except ImportError:
+    import json
+    from json import loads
+
+    def canonical_args(args: dict) -> bytes:
+        return json.dumps(args, sort_keys=True).encode()
+
+PYTHON_COMMAND = ".venv/Scripts/python.exe" if platform.system() == "Windows" else ".venv/bin/python"
+# Interpreter used to launch the server script, by file extension
+SERVER_COMMANDS = {".py": PYTHON_COMMAND, ".js": "node"}
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+TOOL_CACHE_SIZE = 256
+TOOL_CACHE_TTL = 60  # seconds; matches the server's GET cache so fresh HEMIS data still shows up
+# Tools with side effects on the server; their results are never reused
+UNCACHEABLE_TOOLS = frozenset({"generate_student_reference"})
+
+if "OPENAI_API_KEY" not in os.environ:
+    load_dotenv()
+
+def flatten_content(content) -> str:
+    """Flatten MCP tool result content into a single string for the OpenAI API"""
+    if isinstance(content, str):
+        return content
+    return "".join(
+        part.text if part.type == "text" else part.model_dump_json()
+        for part in content
+    )
 
 class MCPClient:
     def __init__(self):
         self.session: Optional[ClientSession] = None
         self.exit_stack = AsyncExitStack()
-        self.client = OpenAI()
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self.client: Optional[AsyncOpenAI] = None
+        self._available_tools: list[dict] = []
+        self._tool_by_name: dict[str, Any] = {}
+        # (tool name, canonical args) -> (stored_at, result)
+        self._tool_cache: OrderedDict[tuple[str, bytes], tuple[float, Any]] = OrderedDict()
 
     async def connect_to_server(self, server_script_path: str):
         """Connect to an MCP server
@@ -25,13 +70,10 @@ class MCPClient:
         Args:
             server_script_path: Path to the server script (.py or .js)
         """
-        is_python = server_script_path.endswith('.py')
-        is_js = server_script_path.endswith('.js')
-        if not (is_python or is_js):
+        command = SERVER_COMMANDS.get(os.path.splitext(server_script_path)[1])
+        if command is None:
             raise ValueError("Server script must be a .py or .js file")
             
-        is_windows = platform.system() == "Windows"
-        command = ".venv/Scripts/python.exe" if is_windows and is_python else ".venv/bin/python" if is_python else "node"
         server_params = StdioServerParameters(
             command=command,
             args=[server_script_path],
@@ -45,22 +87,14 @@ class MCPClient:
         await self.session.initialize()
         
         # List available tools
-        response = await self.session.list_tools()
-        tools = response.tools
+        tools = await self.refresh_tools()
         print("\nConnected to server with tools:", [tool.name for tool in tools])
 
-    async def process_query(self, query: str) -> str:
-        """Process a query using OpenAI and available tools"""
-        messages = [
-            {
-                "role": "user",
-                "content": query
-            }
-        ]
-
+    async def refresh_tools(self):
+        """Fetch the server's tools and cache them in OpenAI tool format"""
         response = await self.session.list_tools()
         # Convert MCP tools to OpenAI tool format
-        available_tools = [{
+        self._available_tools = [{
             "type": "function",
             "function": {
                 "name": tool.name,
@@ -68,65 +102,156 @@ class MCPClient:
                 "parameters": tool.inputSchema
             }
         } for tool in response.tools]
+        self._tool_by_name = {tool.name: tool for tool in response.tools}
+        return response.tools
+
+    def get_client(self) -> AsyncOpenAI:
+        """Create the OpenAI client on first use"""
+        if self.client is None:
+            self.http_client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60.0),
+                timeout=httpx.Timeout(60.0)
+            )
+            # Closed with the stdio and session contexts in cleanup()
+            self.exit_stack.push_async_callback(self.http_client.aclose)
+            self.client = AsyncOpenAI(http_client=self.http_client)
+        return self.client
+
+    async def call_tool_cached(self, tool_name: str, tool_args: dict):
+        """Call an MCP tool, reusing the result of an identical earlier call"""
+        if tool_name not in self._tool_by_name:
+            # Answer this call with an error instead of raising, so the other calls of the turn
+            # still complete and the model can correct itself
+            return CallToolResult(
+                content=[TextContent(type="text", text=f"Unknown tool: {tool_name}")],
+                isError=True
+            )
+
+        if tool_name in UNCACHEABLE_TOOLS:
+            return await self.session.call_tool(tool_name, tool_args)
+
+        key = (tool_name, canonical_args(tool_args))
+        cached = self._tool_cache.get(key)
+        if cached and time.monotonic() - cached[0] < TOOL_CACHE_TTL:
+            self._tool_cache.move_to_end(key)
+            return cached[1]
+
+        result = await self.session.call_tool(tool_name, tool_args)
+        # The server raises on failures (HEMIS outage, login back-off, partial overviews), which
+        # sets isError; don't pin those for the rest of the session
+        if not result.isError:
+            self._tool_cache[key] = (time.monotonic(), result)
+            self._tool_cache.move_to_end(key)
+            if len(self._tool_cache) > TOOL_CACHE_SIZE:
+                self._tool_cache.popitem(last=False)
+        return result
+
+    async def process_query(self, query: str, stream: bool = False) -> str:
+        """Process a query using OpenAI and available tools
+
+        Args:
+            query: User query to send to the model
+            stream: Print the answer as it is generated instead of only returning it
+        """
+        messages = [
+            {
+                "role": "user",
+                "content": query
+            }
+        ]
+
+        client = self.get_client()
+        write = sys.stdout.write
 
         # Initial OpenAI API call
-        response = self.client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o-mini",
             messages=messages,
-            tools=available_tools,
+            tools=self._available_tools,
             tool_choice="auto",
             max_tokens=1000
         )
 
+        assistant_message = response.choices[0].message
+
+        # Fast path: a plain answer needs no tool calls or second round-trip
+        if not assistant_message.tool_calls:
+            text = assistant_message.content or ""
+            if stream:
+                write("\n")
+                write(text)
+                write("\n")
+                sys.stdout.flush()
+            return text
+
         # Process response and handle tool calls
         tool_results = []
-        final_text = []
-        assistant_message = response.choices[0].message
-        final_text.append(assistant_message.content or "")
+        final_text = [assistant_message.content or ""]
+
+        # Add assistant's message with tool calls to the conversation
+        messages.append(assistant_message.model_dump(exclude_none=True))
 
-        # Handle tool calls if present
-        if assistant_message.tool_calls:
-            # Add assistant's message with tool calls to the conversation
+        # Group identical tool calls so each is executed once
+        calls = []
+        unique_calls = {}
+        for tool_call in assistant_message.tool_calls:
+            tool_name = tool_call.function.name
+            tool_args = loads(tool_call.function.arguments)
+            if tool_name in UNCACHEABLE_TOOLS:
+                key = (tool_name, tool_call.id.encode())
+            else:
+                key = (tool_name, canonical_args(tool_args))
+            unique_calls.setdefault(key, (tool_name, tool_args))
+            calls.append((tool_call, tool_name, key))
+
+        # Execute the unique tool calls concurrently
+        unique_results = await asyncio.gather(*(
+            self.call_tool_cached(tool_name, tool_args)
+            for tool_name, tool_args in unique_calls.values()
+        ))
+        results_by_key = dict(zip(unique_calls, unique_results))
+
+        # Process each tool call in the original order
+        for tool_call, tool_name, key in calls:
+            result = results_by_key[key]
+            tool_results.append({"call": tool_name, "result": result})
+            final_text.append(f"[Calling tool {tool_name} with args {tool_call.function.arguments}]")
+
+            # Add tool response to messages
             messages.append({
-                "role": "assistant",
-                "content": assistant_message.content,
-                "tool_calls": [
-                    {
-                        "id": tool_call.id,
-                        "type": "function",
-                        "function": {
-                            "name": tool_call.function.name,
-                            "arguments": tool_call.function.arguments
-                        }
-                    } for tool_call in assistant_message.tool_calls
-                ]
+                "role": "tool",
+                "tool_call_id": tool_call.id,
+                "content": flatten_content(result.content)
             })
 
-            # Process each tool call
-            for tool_call in assistant_message.tool_calls:
-                tool_name = tool_call.function.name
-                tool_args = json.loads(tool_call.function.arguments)
-                
-                # Execute tool call
-                result = await self.session.call_tool(tool_name, tool_args)
-                tool_results.append({"call": tool_name, "result": result})
-                final_text.append(f"[Calling tool {tool_name} with args {tool_args}]")
-
-                # Add tool response to messages
-                messages.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "content": result.content
-                })
-
-            # Get next response from OpenAI with tool results
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages,
-                max_tokens=1000
-            )
-            
-            final_text.append(response.choices[0].message.content)
+        if stream:
+            write("\n")
+            write("\n".join(final_text))
+            write("\n")
+            sys.stdout.flush()
+
+        # Stream next response from OpenAI with tool results
+        response = await client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages,
+            max_tokens=1000,
+            stream=True
+        )
+
+        answer = []
+        async for chunk in response:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                answer.append(delta)
+                if stream:
+                    write(delta)
+                    sys.stdout.flush()
+        if stream:
+            write("\n")
+            sys.stdout.flush()
+
+        final_text.append("".join(answer))
 
         return "\n".join(final_text)
 
@@ -137,13 +262,12 @@ class MCPClient:
         
         while True:
             try:
-                query = input("\nQuery: ").strip()
+                query = (await asyncio.to_thread(input, "\nQuery: ")).strip()
                 
                 if query.lower() == 'quit':
                     break
                     
-                response = await self.process_query(query)
-                print("\n" + response)
+                await self.process_query(query, stream=True)
                     
             except Exception as e:
                 print(f"\nError: {str(e)}")
@@ -165,5 +289,4 @@ async def main():
         await client.cleanup()
 
 if __name__ == "__main__":
-    import sys
     asyncio.run(main())
\ No newline at end of file
@@ -1,212 +1,419 @@
-from typing import Any
+from typing import Any, AsyncIterator, Callable
+from contextlib import asynccontextmanager
 import httpx
 import asyncio
 from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
 import os
 import json
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from operator import itemgetter
+from itertools import groupby
+from importlib.util import find_spec
+from pathlib import Path
+from types import MappingProxyType
+from datetime import date, datetime, timedelta
 from dotenv import load_dotenv
 
-load_dotenv()
+try:
+    import orjson
+    from orjson import loads, dumps
+
+    def dumps_indented(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    from json import loads
 
-mcp = FastMCP("hemis_student")
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    def dumps_indented(obj: Any) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+load_dotenv()
 
 HEMIS_API_BASE = os.getenv("HEMIS_API_BASE")
 STUDENT_LOGIN = os.getenv("HEMIS_LOGIN")
 STUDENT_PASSWORD = os.getenv("HEMIS_PASSWORD")
 TOKEN_CACHE_FILE = os.path.join(os.path.dirname(__file__), 'token_cache.json')
 
-_cached_token = None
-_token_expiry = None
+# HTTP/2 needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+# Only advertise encodings httpx can decode; Brotli needs the optional brotli package (httpx[brotli])
+ACCEPT_ENCODING = "br, gzip, deflate" if find_spec("brotli") or find_spec("brotlicffi") else "gzip, deflate"
+
+# Shared HTTP client so connections to HEMIS are pooled and kept alive between tool calls.
+# Endpoints are resolved against HEMIS_API_BASE and query strings are built by httpx.
+_http_client = httpx.AsyncClient(
+    base_url=HEMIS_API_BASE or "",
+    http2=HTTP2_AVAILABLE,
+    headers={"Accept-Encoding": ACCEPT_ENCODING},
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    timeout=30.0
+)
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    try:
+        yield
+    finally:
+        await _http_client.aclose()
+
+mcp = FastMCP("hemis_student", lifespan=lifespan)
+
+_cached_token: str | None = None
+_token_expiry: datetime | None = None
+_token_file_lock = asyncio.Lock()
+_login_lock = asyncio.Lock()
+
+AUTH_FAILURE_TTL = 30  # seconds to wait before retrying a failed login
+_auth_failed_until = 0.0
+
+GET_CACHE_TTL = 60  # seconds, for responses without ETag/Last-Modified
+PUBLIC_CACHE_TTL = 600  # university-wide statistics change far less often than student data
+GET_CACHE_SIZE = 128
+# (endpoint, params, token) -> (stored_at, etag, last_modified, raw body).
+# Raw bytes are kept and parsed on every hit, because the tools sort the lists they get back in place.
+_get_cache: OrderedDict[tuple[str, tuple, str | None], tuple[float, str | None, str | None, bytes]] = OrderedDict()
+# (endpoint, params, token, cache_ttl, retry_auth) -> request currently on the wire
+_pending_gets: dict[tuple[str, tuple, str | None, float, bool], asyncio.Task] = {}
+
+# Long listings stop rendering once they pass this many characters; the model can't use much more
+MAX_OUTPUT_CHARS = 30000
+
+# Shared read-only fallback for missing nested objects, so `.get("x") or EMPTY_MAPPING`
+# doesn't build a throwaway dict per lookup
+EMPTY_MAPPING = MappingProxyType({})
 
 # ----------------------------- helpers -----------------------------------------
 
-async def make_get_request(url: str, token: str = None) -> dict[str, Any] | None:
+async def make_get_request(
+    endpoint: str,
+    token: str = None,
+    params: dict[str, Any] | None = None,
+    use_cache: bool = True,
+    cache_ttl: float = GET_CACHE_TTL,
+    retry_auth: bool = True
+) -> dict[str, Any] | None:
+    if not use_cache:
+        content = await fetch_get_request(endpoint, token, params, use_cache, cache_ttl, retry_auth)
+    else:
+        # Coalesce identical concurrent GETs (e.g. tools gathered in one turn) onto a single round-trip
+        key = (endpoint, tuple(params.items()) if params else (), token, cache_ttl, retry_auth)
+        task = _pending_gets.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch_get_request(endpoint, token, params, use_cache, cache_ttl, retry_auth))
+            _pending_gets[key] = task
+            task.add_done_callback(lambda _: _pending_gets.pop(key, None))
+        
+        # Shield so one cancelled caller doesn't cancel the request for the others
+        content = await asyncio.shield(task)
+    
+    # Parse per caller: the tools sort the lists they get back in place
+    return loads(content) if content is not None else None
+
+async def fetch_get_request(
+    endpoint: str,
+    token: str = None,
+    params: dict[str, Any] | None = None,
+    use_cache: bool = True,
+    cache_ttl: float = GET_CACHE_TTL,
+    retry_auth: bool = True
+) -> bytes | None:
+    """GET an endpoint through the cache and return the raw body, or None on failure."""
     headers = {}
     if token:
         headers["Authorization"] = f"Bearer {token}"
+    
+    key = (endpoint, tuple(params.items()) if params else (), token)
+    cached = _get_cache.get(key) if use_cache else None
+    if cached:
+        stored_at, etag, last_modified, content = cached
+        # Without validators the entry can only be trusted for a short while
+        if not etag and not last_modified and time.monotonic() - stored_at < cache_ttl:
+            return content
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
         
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            return response.json()
-        except Exception:
-            return None
+    try:
+        response = await _http_client.get(endpoint, params=params, headers=headers)
+        if token and response.status_code == 401:
+            # The server no longer accepts the cached token: log in again and retry once
+            await invalidate_token(token)
+            if not retry_auth:
+                return None
+            new_token = await login_to_hemis()
+            if not new_token or new_token == token:
+                return None
+            return await fetch_get_request(endpoint, new_token, params, use_cache, cache_ttl, retry_auth=False)
+        if cached and response.status_code == 304:
+            _get_cache[key] = (time.monotonic(), etag, last_modified, content)
+            _get_cache.move_to_end(key)
+            return content
+        response.raise_for_status()
+        body = loads(response.content)
+    except Exception:
+        return None
+    
+    if use_cache and isinstance(body, dict) and body.get("success"):
+        _get_cache[key] = (
+            time.monotonic(),
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            response.content
+        )
+        _get_cache.move_to_end(key)
+        if len(_get_cache) > GET_CACHE_SIZE:
+            _get_cache.popitem(last=False)
+    
+    return response.content
 
-async def make_post_request(url: str, data: dict[str, Any]) -> dict[str, Any] | None:
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(url, json=data, timeout=30.0)
-            response.raise_for_status()
-            return response.json()
-        except Exception:
-            return None
+def write_token_cache(token: str, expiry: datetime) -> None:
+    try:
+        with open(TOKEN_CACHE_FILE, 'wb') as f:
+            f.write(dumps({
+                'token': token,
+                'expiry': expiry.isoformat()
+            }))
+    except Exception:
+        pass
+
+def load_token_cache() -> None:
+    global _cached_token, _token_expiry
+    
+    try:
+        data = loads(Path(TOKEN_CACHE_FILE).read_bytes())
+        token = data.get('token')
+        expiry_str = data.get('expiry')
         
+        if token and expiry_str:
+            _cached_token = token
+            _token_expiry = datetime.fromisoformat(expiry_str)
+    except Exception:
+        pass
+
 async def save_token(token: str) -> None:
     global _cached_token, _token_expiry
     
     expiry = datetime.now() + timedelta(days=7)
     _cached_token = token
-    _token_expiry = expiry.isoformat()
+    _token_expiry = expiry
     
+    # Write off the event loop; the lock keeps concurrent logins from interleaving writes
+    async with _token_file_lock:
+        await asyncio.to_thread(write_token_cache, token, expiry)
+
+def remove_token_cache() -> None:
     try:
-        with open(TOKEN_CACHE_FILE, 'w') as f:
-            json.dump({
-                'token': token,
-                'expiry': _token_expiry
-            }, f)
-    except Exception:
+        os.remove(TOKEN_CACHE_FILE)
+    except OSError:
         pass
 
-async def get_cached_token() -> str | None:
+async def invalidate_token(token: str) -> None:
     global _cached_token, _token_expiry
     
-    if _cached_token and _token_expiry:
-        expiry = datetime.fromisoformat(_token_expiry)
-        if datetime.now() < expiry:
-            return _cached_token
+    # Another request may already have replaced the token
+    if _cached_token != token:
+        return
     
-    try:
-        if os.path.exists(TOKEN_CACHE_FILE):
-            with open(TOKEN_CACHE_FILE, 'r') as f:
-                data = json.load(f)
-                token = data.get('token')
-                expiry_str = data.get('expiry')
-                
-                if token and expiry_str:
-                    expiry = datetime.fromisoformat(expiry_str)
-                    if datetime.now() < expiry:
-                        _cached_token = token
-                        _token_expiry = expiry_str
-                        return token
-    except Exception:
-        pass
+    _cached_token = None
+    _token_expiry = None
+    
+    async with _token_file_lock:
+        await asyncio.to_thread(remove_token_cache)
+
+async def get_cached_token() -> str | None:
+    if _cached_token and _token_expiry and datetime.now() < _token_expiry:
+        return _cached_token
     
     return None
         
 async def login_to_hemis() -> str | None:
+    global _auth_failed_until
+    
     cached_token = await get_cached_token()
     if cached_token:
         return cached_token
     
-    endpoint = "auth/login"
-    url = f"{HEMIS_API_BASE}{endpoint}"
-    
-    if not STUDENT_LOGIN or not STUDENT_PASSWORD:
+    # A recent login failed; don't hit HEMIS again until the back-off expires
+    if time.monotonic() < _auth_failed_until:
         return None
     
-    login_data = {
-        "login": STUDENT_LOGIN,
-        "password": STUDENT_PASSWORD
-    }
-    
-    response = await make_post_request(url, login_data)
-    
-    if not response or not response.get("success"):
-        return None
-    
-    token = response["data"]["token"]
-    
-    await save_token(token)
-    
-    return token
+    # Single-flight: concurrent tool calls wait for one login instead of each posting their own
+    async with _login_lock:
+        cached_token = await get_cached_token()
+        if cached_token:
+            return cached_token
+        
+        endpoint = "auth/login"
+        
+        if not STUDENT_LOGIN or not STUDENT_PASSWORD:
+            _auth_failed_until = time.monotonic() + AUTH_FAILURE_TTL
+            return None
+        
+        login_data = {
+            "login": STUDENT_LOGIN,
+            "password": STUDENT_PASSWORD
+        }
+        
+        try:
+            response = await _http_client.post(endpoint, json=login_data)
+            if response.is_client_error:
+                body = None
+            else:
+                response.raise_for_status()
+                body = loads(response.content)
+        except Exception:
+            # Network or server errors are transient, so they don't trigger the back-off
+            return None
+        
+        if not body or not body.get("success"):
+            _auth_failed_until = time.monotonic() + AUTH_FAILURE_TTL
+            return None
+        
+        token = body["data"]["token"]
+        
+        await save_token(token)
+        
+        return token
 
-# ----------------------------- student -----------------------------------------
+AUTH_ERROR_MESSAGE = "Unable to authenticate with HEMIS. Please check your credentials."
 
-@mcp.tool()
-async def get_student_profile(language: str = "en-US") -> str:
-    """Get your personal and academic information from HEMIS.
-    
-    Args:
-        language: Language for the response (e.g. en-US, uz-UZ)
+async def fetch_student_data(
+    endpoint: str,
+    params: dict[str, Any],
+    error_message: str,
+    use_cache: bool = True
+) -> Any:
+    """Log in and GET a student endpoint.
+    
+    Returns the response's "data" payload. Raises ToolError with the message the tool should report,
+    so FastMCP marks the result as an error instead of an ordinary answer.
     """
     token = await login_to_hemis()
     
     if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
+        raise ToolError(AUTH_ERROR_MESSAGE)
     
-    endpoint = "account/me"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}"
-    
-    data = await make_get_request(url, token)
+    data = await make_get_request(endpoint, token, params, use_cache)
     
     if not data or not data.get("success"):
-        return "Unable to fetch student profile information."
-    
-    profile = data["data"]
-    result = []
-    
-    result.append("\n## Personal Information")
-    result.append(f"- Full Name: {profile['first_name']} {profile['second_name']} {profile['third_name']}")
-    result.append(f"- Student ID: {profile['student_id_number']}")
+        raise ToolError(error_message)
     
+    return data["data"]
+
+# time.strftime formats the struct_time directly instead of building a throwaway datetime
+def format_date(timestamp: float) -> str:
+    return time.strftime('%Y-%m-%d', time.localtime(timestamp))
+
+def format_datetime(timestamp: float) -> str:
+    return time.strftime('%Y-%m-%d %H:%M', time.localtime(timestamp))
+
+FILE_SIZE_UNITS = ((1024 * 1024, "MB"), (1024, "KB"))
+
+def format_file_size(size: int) -> str:
+    for threshold, unit in FILE_SIZE_UNITS:
+        if size > threshold:
+            return f"{size / threshold:.2f} {unit}"
+    return f"{size} bytes"
+
+# The token file is only read once per process; afterwards the in-memory copy is authoritative
+load_token_cache()
+
+# ----------------------------- student -----------------------------------------
+
+PROFILE_TEMPLATE = (
+    "\n## Personal Information\n"
+    "- Full Name: {first_name} {second_name} {third_name}\n"
+    "- Student ID: {student_id_number}{birth_date_line}\n"
+    "- Gender: {gender}\n"
+    "- Passport Number: {passport_number}\n"
+    "- Passport PIN: {passport_pin}\n"
+    "- Phone: {phone}{email_line}\n"
+    "\n## Address Information\n"
+    "- Country: {country}\n"
+    "- Province: {province}\n"
+    "- District: {district}\n"
+    "- Address: {address}\n"
+    "- Accommodation: {accommodation}\n"
+    "\n## Academic Information\n"
+    "- University: {university}\n"
+    "- Faculty: {faculty} ({faculty_code})\n"
+    "- Specialty: {specialty} ({specialty_code})\n"
+    "- Group: {group}\n"
+    "- Education Form: {educationForm}\n"
+    "- Education Type: {educationType}\n"
+    "- Education Language: {educationLang}\n"
+    "- Payment Form: {paymentForm}\n"
+    "- Course Level: {level}\n"
+    "- Current Semester: {semester}\n"
+    "- Academic Year: {education_year}\n"
+    "- Student Status: {studentStatus}"
+)
+
+def format_student_profile(profile: dict[str, Any]) -> str:
+    """Render the account/me payload as markdown."""
+    birth_date_line = ""
     if profile.get('birth_date'):
-        from datetime import datetime
-        birth_date = datetime.fromtimestamp(profile['birth_date']).strftime('%Y-%m-%d')
-        result.append(f"- Birth Date: {birth_date}")
-    
-    result.append(f"- Gender: {profile['gender']['name']}")
-    result.append(f"- Passport Number: {profile['passport_number']}")
-    result.append(f"- Passport PIN: {profile['passport_pin']}")
-    result.append(f"- Phone: {profile['phone']}")
-    
-    if profile.get('email') and profile['email']:
-        result.append(f"- Email: {profile['email']}")
-    
-    result.append("\n## Address Information")
-    result.append(f"- Country: {profile['country']['name']}")
-    result.append(f"- Province: {profile['province']['name']}")
-    result.append(f"- District: {profile['district']['name']}")
-    result.append(f"- Address: {profile['address']}")
-    result.append(f"- Accommodation: {profile['accommodation']['name']}")
-    
-    result.append("\n## Academic Information")
-    result.append(f"- University: {profile['university']}")
-    result.append(f"- Faculty: {profile['faculty']['name']} ({profile['faculty']['code']})")
-    result.append(f"- Specialty: {profile['specialty']['name']} ({profile['specialty']['code']})")
-    result.append(f"- Group: {profile['group']['name']}")
-    result.append(f"- Education Form: {profile['educationForm']['name']}")
-    result.append(f"- Education Type: {profile['educationType']['name']}")
-    result.append(f"- Education Language: {profile['educationLang']['name']}")
-    result.append(f"- Payment Form: {profile['paymentForm']['name']}")
-    result.append(f"- Course Level: {profile['level']['name']}")
-    result.append(f"- Current Semester: {profile['semester']['name']}")
-    result.append(f"- Academic Year: {profile['semester']['education_year']['name']}")
-    result.append(f"- Student Status: {profile['studentStatus']['name']}")
+        birth_date_line = f"\n- Birth Date: {format_date(profile['birth_date'])}"
+    
+    # Flatten the nested {"name": ...} objects so the template only needs top-level keys
+    view = {
+        **profile,
+        "birth_date_line": birth_date_line,
+        "email_line": f"\n- Email: {profile['email']}" if profile.get('email') else "",
+        "gender": profile['gender']['name'],
+        "country": profile['country']['name'],
+        "province": profile['province']['name'],
+        "district": profile['district']['name'],
+        "accommodation": profile['accommodation']['name'],
+        "faculty": profile['faculty']['name'],
+        "faculty_code": profile['faculty']['code'],
+        "specialty": profile['specialty']['name'],
+        "specialty_code": profile['specialty']['code'],
+        "group": profile['group']['name'],
+        "educationForm": profile['educationForm']['name'],
+        "educationType": profile['educationType']['name'],
+        "educationLang": profile['educationLang']['name'],
+        "paymentForm": profile['paymentForm']['name'],
+        "level": profile['level']['name'],
+        "semester": profile['semester']['name'],
+        "education_year": profile['semester']['education_year']['name'],
+        "studentStatus": profile['studentStatus']['name'],
+    }
     
-    return "\n".join(result)
+    return PROFILE_TEMPLATE.format_map(view)
 
 @mcp.tool()
-async def get_student_gpa_list(language: str = "en-US") -> str:
-    """Get your GPA information across academic years from HEMIS.
+async def get_student_profile(language: str = "en-US") -> str:
+    """Get your personal and academic information from HEMIS.
     
     Args:
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    token = await login_to_hemis()
-    
-    if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
-    
-    endpoint = "education/gpa-list"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}"
-    
-    data = await make_get_request(url, token)
+    endpoint = "account/me"
+    params = {"l": language}
     
-    if not data or not data.get("success"):
-        return "Unable to fetch GPA information."
+    data = await fetch_student_data(endpoint, params, "Unable to fetch student profile information.")
     
-    gpa_list = data["data"]
+    return format_student_profile(data)
+
+def format_gpa_list(gpa_list: list[dict[str, Any]]) -> str:
+    """Render the education/gpa-list payload as markdown."""
     result = ["# GPA History"]
     
     if not gpa_list:
         result.append("\nNo GPA records found.")
         return "\n".join(result)
     
-    gpa_list.sort(key=lambda x: x["educationYear"]["code"], reverse=True)
+    records = [(gpa_record["educationYear"]["code"], gpa_record) for gpa_record in gpa_list]
+    records.sort(key=itemgetter(0), reverse=True)
     
-    for gpa_record in gpa_list:
+    for _, gpa_record in records:
         year = gpa_record["educationYear"]["name"]
         level = gpa_record["level"]["name"]
         gpa = gpa_record["gpa"]
@@ -236,26 +443,21 @@ async def get_student_gpa_list(language: str = "en-US") -> str:
     return "\n".join(result)
 
 @mcp.tool()
-async def get_student_semesters(language: str = "en-US") -> str:
-    """Get your semester information across academic years from HEMIS.
+async def get_student_gpa_list(language: str = "en-US") -> str:
+    """Get your GPA information across academic years from HEMIS.
     
     Args:
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    token = await login_to_hemis()
-    
-    if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
-    
-    endpoint = "education/semesters"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}"
-    
-    data = await make_get_request(url, token)
+    endpoint = "education/gpa-list"
+    params = {"l": language}
     
-    if not data or not data.get("success"):
-        return "Unable to fetch semester information."
+    data = await fetch_student_data(endpoint, params, "Unable to fetch GPA information.")
     
-    semesters = data["data"]
+    return format_gpa_list(data)
+
+def format_semesters(semesters: list[dict[str, Any]]) -> str:
+    """Render the education/semesters payload as markdown."""
     result = ["# Academic Semester History"]
     
     if not semesters:
@@ -274,54 +476,105 @@ async def get_student_semesters(language: str = "en-US") -> str:
                 result.append("*Current academic year*")
             current_year = year
         
-        result.append(f"\n### Semester code: {semester["code"]}")
+        result.append(f"\n### Semester code: {semester['code']}")
         
         if semester["current"]:
             result.append("**Current semester**")
         
         if semester.get("weeks") and len(semester["weeks"]) > 0:
             weeks = semester["weeks"]
-            from datetime import datetime
             
-            first_week = min(weeks, key=lambda w: w["start_date"])
-            last_week = max(weeks, key=lambda w: w["end_date"])
+            # Find the semester bounds and the current week in a single pass
+            first_start = weeks[0]["start_date"]
+            last_end = weeks[0]["end_date"]
+            current_week = None
+            for week in weeks:
+                if week["start_date"] < first_start:
+                    first_start = week["start_date"]
+                if week["end_date"] > last_end:
+                    last_end = week["end_date"]
+                if current_week is None and week.get("current"):
+                    current_week = week
             
-            start_date = datetime.fromtimestamp(first_week["start_date"]).strftime('%Y-%m-%d')
-            end_date = datetime.fromtimestamp(last_week["end_date"]).strftime('%Y-%m-%d')
+            start_date = format_date(first_start)
+            end_date = format_date(last_end)
             
             result.append(f"- Start Date: {start_date}")
             result.append(f"- End Date: {end_date}")
             result.append(f"- Number of Weeks: {len(weeks)}")
             
-            current_weeks = [w for w in weeks if w.get("current")]
-            if current_weeks:
-                current_week = current_weeks[0]
+            if current_week:
                 result.append(f"- Current Week: {current_week['start_date_f']} to {current_week['end_date_f']}")
     
     return "\n".join(result)
 
 @mcp.tool()
-async def get_student_subjects(semester: str | int, language: str = "en-US") -> str:
-    """Get your subjects and grades for a specific semester from HEMIS.
+async def get_student_semesters(language: str = "en-US") -> str:
+    """Get your semester information across academic years from HEMIS.
+    
+    Args:
+        language: Language for the response (e.g. en-US, uz-UZ)
+    """
+    endpoint = "education/semesters"
+    params = {"l": language}
+    
+    data = await fetch_student_data(endpoint, params, "Unable to fetch semester information.")
+    
+    return format_semesters(data)
+
+@mcp.tool()
+async def get_student_overview(language: str = "en-US") -> str:
+    """Get your profile, GPA history and semesters from HEMIS in a single call.
     
     Args:
-        semester: Semester code to get subjects for (e.g. "14" for 4th semester")
         language: Language for the response (e.g. en-US, uz-UZ)
     """
     token = await login_to_hemis()
     
     if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
+        raise ToolError(AUTH_ERROR_MESSAGE)
+    
+    sections = [
+        ("account/me", format_student_profile, "Unable to fetch student profile information."),
+        ("education/gpa-list", format_gpa_list, "Unable to fetch GPA information."),
+        ("education/semesters", format_semesters, "Unable to fetch semester information."),
+    ]
+    
+    # The three endpoints are independent, so fetch them concurrently
+    responses = await asyncio.gather(
+        *(make_get_request(endpoint, token, {"l": language}) for endpoint, _, _ in sections),
+        return_exceptions=True
+    )
+    
+    result = ["# Student Overview"]
+    failed = False
+    
+    for (_, formatter, error_message), data in zip(sections, responses):
+        if isinstance(data, BaseException) or not data or not data.get("success"):
+            result.append(f"\n{error_message}")
+            failed = True
+        else:
+            result.append(formatter(data["data"]))
     
-    endpoint = "education/subject-list"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}&semester={semester}"
+    # A partial overview is still an error, so clients don't reuse it; the loaded sections stay in the message
+    if failed:
+        raise ToolError("\n".join(result))
     
-    data = await make_get_request(url, token)
+    return "\n".join(result)
+
+@mcp.tool()
+async def get_student_subjects(semester: str | int, language: str = "en-US") -> str:
+    """Get your subjects and grades for a specific semester from HEMIS.
     
-    if not data or not data.get("success"):
-        return "Unable to fetch subject information for the specified semester."
+    Args:
+        semester: Semester code to get subjects for (e.g. "14" for 4th semester")
+        language: Language for the response (e.g. en-US, uz-UZ)
+    """
+    endpoint = "education/subject-list"
+    params = {"l": language, "semester": semester}
+    
+    subjects = await fetch_student_data(endpoint, params, "Unable to fetch subject information for the specified semester.")
     
-    subjects = data["data"]
     result = [f"# Subject List for Semester {semester}"]
     
     if not subjects:
@@ -364,20 +617,11 @@ async def get_student_subjects_list(semester: str | int, language: str = "en-US"
         semester: Semester code to get subjects for (e.g. "14" for 4th semester")
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    token = await login_to_hemis()
-    
-    if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
-    
     endpoint = "education/subjects"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}&semester={semester}"
-    
-    data = await make_get_request(url, token)
+    params = {"l": language, "semester": semester}
     
-    if not data or not data.get("success"):
-        return "Unable to fetch subjects list for the specified semester."
+    subjects = await fetch_student_data(endpoint, params, "Unable to fetch subjects list for the specified semester.")
     
-    subjects = data["data"]
     result = [f"# Subject List for Semester {semester}"]
     
     if not subjects:
@@ -405,6 +649,31 @@ async def get_student_subjects_list(semester: str | int, language: str = "en-US"
     
     return "\n".join(result)
 
+def format_attendance_record(record: dict[str, Any]) -> str:
+    """Render one attendance record as a markdown list item."""
+    if record.get("lesson_date"):
+        date = format_date(record["lesson_date"])
+    else:
+        date = "Unknown Date"
+    
+    lesson_pair = record.get("lessonPair") or EMPTY_MAPPING
+    start_time = lesson_pair.get("start_time", "")
+    end_time = lesson_pair.get("end_time", "")
+    time_info = f"{start_time}-{end_time}" if start_time and end_time else "Unknown time"
+    
+    status = "Present"
+    if record.get("absent_on") or record.get("absent_off"):
+        if record.get("explicable"):
+            status = "Excused Absence"
+        else:
+            status = "Unexcused Absence"
+    
+    return (
+        f"- **{date}** ({(record.get('trainingType') or EMPTY_MAPPING).get('name', 'Unknown Type')}, {time_info})\n"
+        f"  - Instructor: {(record.get('employee') or EMPTY_MAPPING).get('name', 'Unknown Instructor')}\n"
+        f"  - Status: {status}"
+    )
+
 @mcp.tool()
 async def get_student_attendance(subject: str | int, semester: str | int, language: str = "en-US") -> str:
     """Get your attendance information for a specific subject in a semester from HEMIS.
@@ -414,72 +683,39 @@ async def get_student_attendance(subject: str | int, semester: str | int, langua
         semester: Semester code to get subjects for (e.g. "14" for 4th semester")
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    token = await login_to_hemis()
-    
-    if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
-    
     endpoint = "education/attendance"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}&subject={subject}&semester={semester}"
-    
-    data = await make_get_request(url, token)
+    params = {"l": language, "subject": subject, "semester": semester}
     
-    if not data or not data.get("success"):
-        return "Unable to fetch attendance information for the specified subject and semester."
-    
-    attendance_records = data["data"]
+    attendance_records = await fetch_student_data(endpoint, params, "Unable to fetch attendance information for the specified subject and semester.")
     
     if not attendance_records:
         return "No attendance records found for this subject in the specified semester."
     
     first_record = attendance_records[0]
-    subject_info = first_record.get("subject", {})
+    subject_info = first_record.get("subject") or EMPTY_MAPPING
     subject_name = subject_info.get("name", "Unknown Subject")
     subject_code = subject_info.get("code", "")
     
     result = [f"# Attendance for {subject_name} ({subject_code})"]
     
     total_lessons = len(attendance_records)
-    absent_count = sum(1 for record in attendance_records if record.get("absent_on") or record.get("absent_off"))
-    explicable_absences = sum(1 for record in attendance_records if 
-                             (record.get("absent_on") or record.get("absent_off")) and record.get("explicable"))
+    absent_count = 0
+    explicable_absences = 0
+    for record in attendance_records:
+        if record.get("absent_on") or record.get("absent_off"):
+            absent_count += 1
+            if record.get("explicable"):
+                explicable_absences += 1
     
     result.append(f"\n**Total Lessons:** {total_lessons}")
     result.append(f"**Absences:** {absent_count}")
     result.append(f"**Excused Absences:** {explicable_absences}")
     result.append(f"**Attendance Rate:** {((total_lessons - absent_count) / total_lessons * 100):.1f}%")
     
-    attendance_records.sort(key=lambda x: x.get("lesson_date", 0))
+    attendance_records.sort(key=lambda x: x.get("lesson_date") or 0)
     
     result.append("\n## Attendance Records")
-    
-    for record in attendance_records:
-        from datetime import datetime
-        
-        if record.get("lesson_date"):
-            date = datetime.fromtimestamp(record["lesson_date"]).strftime('%Y-%m-%d')
-        else:
-            date = "Unknown Date"
-        
-        training_type = record.get("trainingType", {}).get("name", "Unknown Type")
-        
-        lesson_pair = record.get("lessonPair", {})
-        start_time = lesson_pair.get("start_time", "")
-        end_time = lesson_pair.get("end_time", "")
-        time_info = f"{start_time}-{end_time}" if start_time and end_time else "Unknown time"
-        
-        employee = record.get("employee", {}).get("name", "Unknown Instructor")
-        
-        status = "Present"
-        if record.get("absent_on") or record.get("absent_off"):
-            if record.get("explicable"):
-                status = "Excused Absence"
-            else:
-                status = "Unexcused Absence"
-        
-        result.append(f"- **{date}** ({training_type}, {time_info})")
-        result.append(f"  - Instructor: {employee}")
-        result.append(f"  - Status: {status}")
+    result.append("\n".join([format_attendance_record(record) for record in attendance_records]))
     
     return "\n".join(result)
 
@@ -491,76 +727,66 @@ async def get_student_exams(semester: str | int, language: str = "en-US") -> str
         semester: Semester code to get subjects for (e.g. "14" for 4th semester")
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    token = await login_to_hemis()
-    
-    if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
-    
     endpoint = "education/exam-table"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}&semester={semester}"
-    
-    data = await make_get_request(url, token)
+    params = {"l": language, "semester": semester}
     
-    if not data or not data.get("success"):
-        return "Unable to fetch exam schedule for the specified semester."
+    exam_records = await fetch_student_data(endpoint, params, "Unable to fetch exam schedule for the specified semester.")
     
-    exam_records = data["data"]
     result = [f"# Exam Schedule for Semester {semester}"]
     
     if not exam_records:
         result.append("\nNo exams scheduled for this semester.")
         return "\n".join(result)
     
-    exam_records.sort(key=lambda x: x.get("examDate", 0))
+    exam_records.sort(key=lambda x: x.get("examDate") or 0)
     
     if exam_records:
         first_exam = exam_records[0]
-        education_year = first_exam.get("educationYear", {}).get("name", "Unknown Academic Year")
-        group = first_exam.get("group", {}).get("name", "Unknown Group")
+        education_year = (first_exam.get("educationYear") or EMPTY_MAPPING).get("name", "Unknown Academic Year")
+        group = (first_exam.get("group") or EMPTY_MAPPING).get("name", "Unknown Group")
         result.append(f"\nAcademic Year: **{education_year}**")
         result.append(f"Group: **{group}**")
     
     result.append("\n## Scheduled Exams")
     
     for exam in exam_records:
-        from datetime import datetime
-        
-        subject_info = exam.get("subject", {})
+        subject_info = exam.get("subject") or EMPTY_MAPPING
         subject_name = subject_info.get("name", "Unknown Subject")
         subject_code = subject_info.get("code", "")
         
         exam_date_ts = exam.get("examDate", 0)
         if exam_date_ts:
-            exam_date = datetime.fromtimestamp(exam_date_ts).strftime('%Y-%m-%d')
+            exam_date = format_date(exam_date_ts)
         else:
             exam_date = "Date not specified"
         
-        lesson_pair = exam.get("lessonPair", {})
+        lesson_pair = exam.get("lessonPair") or EMPTY_MAPPING
         start_time = lesson_pair.get("start_time", "")
         end_time = lesson_pair.get("end_time", "")
         time_info = f"{start_time}-{end_time}" if start_time and end_time else "Time not specified"
         
-        exam_type = exam.get("examType", {}).get("name", "Unknown Type")
-        final_exam_type = exam.get("finalExamType", {}).get("name", "")
+        exam_type = (exam.get("examType") or EMPTY_MAPPING).get("name", "Unknown Type")
+        final_exam_type = (exam.get("finalExamType") or EMPTY_MAPPING).get("name", "")
         
-        instructor = exam.get("employee", {}).get("name", "Not specified")
+        instructor = (exam.get("employee") or EMPTY_MAPPING).get("name", "Not specified")
         
-        auditorium = exam.get("auditorium", {})
+        auditorium = exam.get("auditorium") or EMPTY_MAPPING
         room = auditorium.get("name", "Not specified")
-        building = auditorium.get("building", {}).get("name", "")
+        building = (auditorium.get("building") or EMPTY_MAPPING).get("name", "")
         location = f"{room}, {building}" if building else room
         
-        result.append(f"\n### {subject_name} ({subject_code})")
-        result.append(f"- **Date:** {exam_date}")
-        result.append(f"- **Time:** {time_info}")
-        result.append(f"- **Exam Type:** {exam_type}")
-        if final_exam_type:
-            result.append(f"- **Final Exam Type:** {final_exam_type}")
-        result.append(f"- **Instructor:** {instructor}")
-        result.append(f"- **Location:** {location}")
-        
-        department = exam.get("department", {}).get("name", "")
-        faculty = exam.get("faculty", {}).get("name", "")
+        final_exam_line = f"\n- **Final Exam Type:** {final_exam_type}" if final_exam_type else ""
+        result.append(
+            f"\n### {subject_name} ({subject_code})\n"
+            f"- **Date:** {exam_date}\n"
+            f"- **Time:** {time_info}\n"
+            f"- **Exam Type:** {exam_type}{final_exam_line}\n"
+            f"- **Instructor:** {instructor}\n"
+            f"- **Location:** {location}"
+        )
+        
+        department = (exam.get("department") or EMPTY_MAPPING).get("name", "")
+        faculty = (exam.get("faculty") or EMPTY_MAPPING).get("name", "")
         if department:
             result.append(f"- **Department:** {department}")
         if faculty:
@@ -577,31 +803,21 @@ async def get_student_performance(subject: str | int, semester: str | int, langu
         semester: Semester code to get subjects for (e.g. "14" for 4th semester")
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    token = await login_to_hemis()
-    
-    if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
-    
     endpoint = "education/performance"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}&subject={subject}&semester={semester}"
+    params = {"l": language, "subject": subject, "semester": semester}
     
-    data = await make_get_request(url, token)
-    
-    if not data or not data.get("success"):
-        return "Unable to fetch performance information for the specified subject and semester."
-    
-    performance = data["data"]
+    performance = await fetch_student_data(endpoint, params, "Unable to fetch performance information for the specified subject and semester.")
     
     if not performance:
         return "No performance data found for this subject in the specified semester."
     
-    subject_info = performance.get("subject", {})
+    subject_info = performance.get("subject") or EMPTY_MAPPING
     subject_name = subject_info.get("name", "Unknown Subject")
     subject_code = subject_info.get("code", "")
     
     result = [f"# Performance for {subject_name} ({subject_code})"]
     
-    subject_type = performance.get("subjectType", {}).get("name", "Unknown Type")
+    subject_type = (performance.get("subjectType") or EMPTY_MAPPING).get("name", "Unknown Type")
     credit = performance.get("credit", 0)
     total_acload = performance.get("total_acload", 0)
     
@@ -635,11 +851,11 @@ async def get_student_performance(subject: str | int, semester: str | int, langu
             task_name = task.get("name", "Unnamed Task")
             result.append(f"\n### {task_name}")
             
-            training_type = task.get("trainingType", {}).get("name", "")
+            training_type = (task.get("trainingType") or EMPTY_MAPPING).get("name", "")
             if training_type:
                 result.append(f"- Training Type: {training_type}")
             
-            task_type = task.get("taskType", {}).get("name", "")
+            task_type = (task.get("taskType") or EMPTY_MAPPING).get("name", "")
             if task_type:
                 result.append(f"- Task Type: {task_type}")
                 
@@ -649,19 +865,18 @@ async def get_student_performance(subject: str | int, semester: str | int, langu
             
             deadline = task.get("deadline")
             if deadline:
-                from datetime import datetime
-                deadline_date = datetime.fromtimestamp(deadline).strftime('%Y-%m-%d %H:%M')
+                deadline_date = format_datetime(deadline)
                 result.append(f"- Deadline: {deadline_date}")
                 
             attempt_limit = task.get("attempt_limit")
             if attempt_limit:
                 result.append(f"- Attempt Limit: {attempt_limit}")
                 
-            task_status = task.get("taskStatus", {}).get("name", "")
+            task_status = (task.get("taskStatus") or EMPTY_MAPPING).get("name", "")
             if task_status:
                 result.append(f"- Status: {task_status}")
                 
-            employee = task.get("employee", {}).get("name", "")
+            employee = (task.get("employee") or EMPTY_MAPPING).get("name", "")
             if employee:
                 result.append(f"- Instructor: {employee}")
                 
@@ -677,11 +892,7 @@ async def get_student_performance(subject: str | int, semester: str | int, langu
                     file_size = file.get("size", 0)
                     file_url = file.get("url", "")
                     
-                    size_display = f"{file_size} bytes"
-                    if file_size > 1024 * 1024:
-                        size_display = f"{file_size / (1024 * 1024):.2f} MB"
-                    elif file_size > 1024:
-                        size_display = f"{file_size / 1024:.2f} KB"
+                    size_display = format_file_size(file_size)
                         
                     if file_url:
                         result.append(f"- [{file_name}]({file_url}) ({size_display})")
@@ -699,22 +910,12 @@ async def get_student_contract(language: str = "en-US") -> str:
     Args:
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    token = await login_to_hemis()
-    
-    if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
-    
     endpoint = "student/contract"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}"
-    
-    data = await make_get_request(url, token)
-    
-    if not data or not data.get("success"):
-        return "Unable to fetch student contract information."
+    params = {"l": language}
     
-    contract_data = data["data"]
+    contract_data = await fetch_student_data(endpoint, params, "Unable to fetch student contract information.")
     
-    return json.dumps(contract_data, indent=2)
+    return dumps_indented(contract_data)
 
 @mcp.tool()
 async def get_student_contract_list(language: str = "en-US") -> str:
@@ -723,21 +924,13 @@ async def get_student_contract_list(language: str = "en-US") -> str:
     Args:
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    token = await login_to_hemis()
-    
-    if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
-    
     endpoint = "student/contract-list"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}"
-    
-    data = await make_get_request(url, token)
+    params = {"l": language}
     
-    if not data or not data.get("success"):
-        return "Unable to fetch student contract list."
+    data = await fetch_student_data(endpoint, params, "Unable to fetch student contract list.")
     
-    contract_list = data["data"].get("items", [])
-    attributes = data["data"].get("attributes", {})
+    contract_list = data.get("items", [])
+    attributes = data.get("attributes") or EMPTY_MAPPING
     
     if not contract_list:
         return "No contracts found in your student record."
@@ -808,53 +1001,43 @@ async def get_student_decrees(language: str = "en-US") -> str:
     Args:
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    token = await login_to_hemis()
-    
-    if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
-    
     endpoint = "student/decree"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}"
-    
-    data = await make_get_request(url, token)
+    params = {"l": language}
     
-    if not data or not data.get("success"):
-        return "Unable to fetch student decree information."
-    
-    decrees = data["data"]
+    decrees = await fetch_student_data(endpoint, params, "Unable to fetch student decree information.")
     
     if not decrees:
         return "No official decrees found in your student record."
     
     result = ["# Official Student Decrees"]
     
-    decrees.sort(key=lambda x: x.get("date", 0), reverse=True)
+    decrees.sort(key=lambda x: x.get("date") or 0, reverse=True)
     
     for decree in decrees:
-        from datetime import datetime
-        
         decree_number = decree.get("number", "Unknown Number")
         decree_name = decree.get("name", "Unnamed Decree")
         
         date_ts = decree.get("date", 0)
         if date_ts:
-            decree_date = datetime.fromtimestamp(date_ts).strftime('%Y-%m-%d')
+            decree_date = format_date(date_ts)
         else:
             decree_date = "Date not specified"
             
-        decree_type = decree.get("decreeType", {}).get("name", "Unknown Type")
+        decree_type = (decree.get("decreeType") or EMPTY_MAPPING).get("name", "Unknown Type")
         
-        department = decree.get("department", {})
+        department = decree.get("department") or EMPTY_MAPPING
         department_name = department.get("name", "Unknown Department")
         department_code = department.get("code", "")
         
         file_url = decree.get("file", "")
         
-        result.append(f"\n## {decree_name}")
-        result.append(f"- **Decree Number:** {decree_number}")
-        result.append(f"- **Date:** {decree_date}")
-        result.append(f"- **Type:** {decree_type}")
-        result.append(f"- **Department:** {department_name} ({department_code})")
+        result.append(
+            f"\n## {decree_name}\n"
+            f"- **Decree Number:** {decree_number}\n"
+            f"- **Date:** {decree_date}\n"
+            f"- **Type:** {decree_type}\n"
+            f"- **Department:** {department_name} ({department_code})"
+        )
         
         if file_url:
             result.append(f"- **Document Link:** [Download Decree]({file_url})")
@@ -868,20 +1051,10 @@ async def get_student_documents(language: str = "en-US") -> str:
     Args:
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    token = await login_to_hemis()
-    
-    if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
-    
     endpoint = "student/document"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}"
+    params = {"l": language}
     
-    data = await make_get_request(url, token)
-    
-    if not data or not data.get("success"):
-        return "Unable to fetch student document information."
-    
-    documents = data["data"]
+    documents = await fetch_student_data(endpoint, params, "Unable to fetch student document information.")
     
     if not documents:
         return "No official documents found in your student record."
@@ -911,6 +1084,19 @@ async def get_student_documents(language: str = "en-US") -> str:
     
     return "\n".join(result)
 
+DOCUMENT_TYPE_LABELS = {
+    "diploma": "Diplomas",
+    "supplement": "Diploma Supplements",
+    "academic_sheet": "Academic Sheets",
+    "academic_data": "Grade Books",
+    "reference": "Student References",
+    "decree": "Academic Orders/Decrees",
+    "unknown": "Other Documents"
+}
+
+def document_type(document: dict[str, Any]) -> str:
+    return document.get("type") or "unknown"
+
 @mcp.tool()
 async def get_all_student_documents(language: str = "en-US") -> str:
     """Get all your official documents (diplomas, transcripts, references, decrees, etc.) from HEMIS.
@@ -918,51 +1104,33 @@ async def get_all_student_documents(language: str = "en-US") -> str:
     Args:
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    token = await login_to_hemis()
-    
-    if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
-    
     endpoint = "student/document-all"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}"
-    
-    data = await make_get_request(url, token)
-    
-    if not data or not data.get("success"):
-        return "Unable to fetch student documents information."
+    params = {"l": language}
     
-    documents = data["data"]
+    documents = await fetch_student_data(endpoint, params, "Unable to fetch student documents information.")
     
     if not documents:
         return "No documents found in your student record."
     
     result = ["# All Student Documents"]
     
-    document_types = {}
-    for document in documents:
-        doc_type = document.get("type", "unknown")
-        if doc_type not in document_types:
-            document_types[doc_type] = []
-        document_types[doc_type].append(document)
-    
-    type_labels = {
-        "diploma": "Diplomas",
-        "supplement": "Diploma Supplements",
-        "academic_sheet": "Academic Sheets",
-        "academic_data": "Grade Books",
-        "reference": "Student References",
-        "decree": "Academic Orders/Decrees",
-        "unknown": "Other Documents"
-    }
+    # Both sorts are stable: newest first within a type, types in alphabetical order
+    documents.sort(key=lambda x: x.get("id") or 0, reverse=True)
+    documents.sort(key=document_type)
     
-    for doc_type in sorted(document_types.keys()):
-        docs = document_types[doc_type]
-        type_label = type_labels.get(doc_type, doc_type.title())
-        result.append(f"\n## {type_label}")
+    output_len = 0
+    shown = 0
+    for doc_type, docs in groupby(documents, key=document_type):
+        # Check the size before the heading, so a truncated listing never ends on an empty group
+        if output_len > MAX_OUTPUT_CHARS:
+            break
         
-        docs.sort(key=lambda x: x.get("id", 0), reverse=True)
+        type_label = DOCUMENT_TYPE_LABELS.get(doc_type, doc_type.title())
+        result.append(f"\n## {type_label}")
+        output_len += len(result[-1])
         
         for document in docs:
+            row_start = len(result)
             doc_name = document.get("name", "Unnamed Document")
             doc_id = document.get("id", "")
             file_url = document.get("file", "")
@@ -984,6 +1152,14 @@ async def get_all_student_documents(language: str = "en-US") -> str:
             
             if link_url and link_url != file_url:
                 result.append(f"\n[View Online]({link_url})")
+            
+            shown += 1
+            output_len += sum(map(len, result[row_start:]))
+            if output_len > MAX_OUTPUT_CHARS and shown < len(documents):
+                break
+    
+    if shown < len(documents):
+        result.append(f"\n*Output truncated after {shown} of {len(documents)} documents.*")
     
     return "\n".join(result)
 
@@ -994,60 +1170,50 @@ async def get_student_references(language: str = "en-US") -> str:
     Args:
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    token = await login_to_hemis()
-    
-    if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
-    
     endpoint = "student/reference"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}"
-    
-    data = await make_get_request(url, token)
-    
-    if not data or not data.get("success"):
-        return "Unable to fetch student references."
+    params = {"l": language}
     
-    references = data["data"]
+    references = await fetch_student_data(endpoint, params, "Unable to fetch student references.")
     
     if not references:
         return "No references found in your student record."
     
     result = ["# Student References"]
     
-    references.sort(key=lambda x: x.get("reference_date", 0), reverse=True)
+    references.sort(key=lambda x: x.get("reference_date") or 0, reverse=True)
     
     for reference in references:
-        from datetime import datetime
-        
         ref_number = reference.get("reference_number", "Unknown Number")
         
         ref_date_ts = reference.get("reference_date", 0)
         if ref_date_ts:
-            ref_date = datetime.fromtimestamp(ref_date_ts).strftime('%Y-%m-%d')
+            ref_date = format_date(ref_date_ts)
         else:
             ref_date = "Date not specified"
             
-        department = reference.get("department", {})
+        department = reference.get("department") or EMPTY_MAPPING
         department_name = department.get("name", "Unknown Department")
         department_code = department.get("code", "")
         
-        semester = reference.get("semester", {})
+        semester = reference.get("semester") or EMPTY_MAPPING
         semester_name = semester.get("name", "Unknown Semester")
         
-        education_year = semester.get("education_year", {})
+        education_year = semester.get("education_year") or EMPTY_MAPPING
         year_name = education_year.get("name", "Unknown Academic Year")
         
-        level = reference.get("level", {})
+        level = reference.get("level") or EMPTY_MAPPING
         level_name = level.get("name", "Unknown Level")
         
         file_url = reference.get("file", "")
         
-        result.append(f"\n## Reference {ref_number}")
-        result.append(f"- **Date:** {ref_date}")
-        result.append(f"- **Department:** {department_name} ({department_code})")
-        result.append(f"- **Academic Year:** {year_name}")
-        result.append(f"- **Semester:** {semester_name}")
-        result.append(f"- **Level:** {level_name}")
+        result.append(
+            f"\n## Reference {ref_number}\n"
+            f"- **Date:** {ref_date}\n"
+            f"- **Department:** {department_name} ({department_code})\n"
+            f"- **Academic Year:** {year_name}\n"
+            f"- **Semester:** {semester_name}\n"
+            f"- **Level:** {level_name}"
+        )
         
         if file_url:
             result.append(f"- **Document:** [Download Reference]({file_url})")
@@ -1061,40 +1227,30 @@ async def generate_student_reference(language: str = "en-US") -> str:
     Args:
         language: Language for the reference (e.g. en-US, uz-UZ)
     """
-    token = await login_to_hemis()
-    
-    if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
-    
     endpoint = "student/reference-generate"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}"
+    params = {"l": language}
     
-    data = await make_get_request(url, token)
+    reference = await fetch_student_data(endpoint, params, "Unable to generate student reference. The university might not allow automatic reference generation.", use_cache=False)
     
-    if not data or not data.get("success"):
-        return "Unable to generate student reference. The university might not allow automatic reference generation."
-    
-    reference = data["data"]
     result = ["# Student Reference Generated"]
     
     ref_number = reference.get("reference_number", "Unknown Number")
     result.append(f"\n**Reference Number:** {ref_number}")
     
     if reference.get("reference_date"):
-        from datetime import datetime
-        ref_date = datetime.fromtimestamp(reference["reference_date"]).strftime('%Y-%m-%d')
+        ref_date = format_date(reference["reference_date"])
         result.append(f"**Date Generated:** {ref_date}")
     
-    semester = reference.get("semester", {})
+    semester = reference.get("semester") or EMPTY_MAPPING
     semester_name = semester.get("name", "Unknown Semester")
     
-    education_year = semester.get("education_year", {})
+    education_year = semester.get("education_year") or EMPTY_MAPPING
     year_name = education_year.get("name", "Unknown Academic Year")
     
-    level = reference.get("level", {})
+    level = reference.get("level") or EMPTY_MAPPING
     level_name = level.get("name", "Unknown Level")
     
-    department = reference.get("department", {})
+    department = reference.get("department") or EMPTY_MAPPING
     department_name = department.get("name", "Unknown Department")
     department_code = department.get("code", "")
     
@@ -1122,27 +1278,17 @@ async def get_student_resources(subject: str | int, semester: str | int, languag
         semester: Semester code to get subjects for (e.g. "14" for 4th semester")
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    token = await login_to_hemis()
-    
-    if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
-    
     endpoint = "education/resources"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}&subject={subject}&semester={semester}"
-    
-    data = await make_get_request(url, token)
+    params = {"l": language, "subject": subject, "semester": semester}
     
-    if not data or not data.get("success"):
-        return "Unable to fetch resources for the specified subject and semester."
-    
-    resources = data["data"]
+    resources = await fetch_student_data(endpoint, params, "Unable to fetch resources for the specified subject and semester.")
     
     if not resources:
         return "No electronic resources found for this subject in the specified semester."
     
     result = [f"# Electronic Resources for Subject #{subject} in Semester #{semester}"]
     
-    resources.sort(key=lambda x: x.get("updated_at", 0), reverse=True)
+    resources.sort(key=lambda x: x.get("updated_at") or 0, reverse=True)
     
     for resource in resources:
         title = resource.get("title", "Untitled Resource")
@@ -1151,17 +1297,16 @@ async def get_student_resources(subject: str | int, semester: str | int, languag
         if resource.get("comment"):
             result.append(f"\n{resource['comment']}")
         
-        training_type = resource.get("trainingType", {}).get("name", "")
+        training_type = (resource.get("trainingType") or EMPTY_MAPPING).get("name", "")
         if training_type:
             result.append(f"\n**Training Type:** {training_type}")
         
-        employee = resource.get("employee", {}).get("name", "")
+        employee = (resource.get("employee") or EMPTY_MAPPING).get("name", "")
         if employee:
             result.append(f"**Instructor:** {employee}")
         
         if resource.get("updated_at"):
-            from datetime import datetime
-            update_date = datetime.fromtimestamp(resource["updated_at"]).strftime('%Y-%m-%d %H:%M')
+            update_date = format_datetime(resource["updated_at"])
             result.append(f"**Updated:** {update_date}")
         
         resource_url = resource.get("url", "")
@@ -1176,11 +1321,7 @@ async def get_student_resources(subject: str | int, semester: str | int, languag
                 file_size = file.get("size", 0)
                 file_url = file.get("url", "")
                 
-                size_display = f"{file_size} bytes"
-                if file_size > 1024 * 1024:
-                    size_display = f"{file_size / (1024 * 1024):.2f} MB"
-                elif file_size > 1024:
-                    size_display = f"{file_size / 1024:.2f} KB"
+                size_display = format_file_size(file_size)
                     
                 if file_url:
                     result.append(f"- [{file_name}]({file_url}) ({size_display})")
@@ -1191,6 +1332,9 @@ async def get_student_resources(subject: str | int, semester: str | int, languag
     
     return "\n".join(result)
 
+def lesson_day(lesson: dict[str, Any]) -> date:
+    return datetime.fromtimestamp(lesson["lesson_date"]).date()
+
 @mcp.tool()
 async def get_student_schedule(semester: str | int, week: str = None, language: str = "en-US") -> str:
     """Get your class schedule for a specific semester and week from HEMIS.
@@ -1200,84 +1344,66 @@ async def get_student_schedule(semester: str | int, week: str = None, language:
         week: Week ID to get the schedule for (optional, gets current week if not specified)
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    token = await login_to_hemis()
-    
-    if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
-    
     endpoint = "education/schedule"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}&semester={semester}"
+    params = {"l": language, "semester": semester}
     
     if week:
-        url += f"&week={week}"
-    
-    data = await make_get_request(url, token)
-    
-    if not data or not data.get("success"):
-        return "Unable to fetch schedule for the specified semester and week."
+        params["week"] = week
     
-    schedule = data["data"]
+    schedule = await fetch_student_data(endpoint, params, "Unable to fetch schedule for the specified semester and week.")
     
     if not schedule:
         return "No schedule found for the specified semester and week."
     
     result = [f"# Class Schedule for Semester {semester}"]
     
-    # Group by date and lesson pair for better organization
-    from collections import defaultdict
-    from datetime import datetime
-    
     # Sort schedule entries by lesson date and then by lesson pair
-    schedule.sort(key=lambda x: (x.get("lesson_date", 0), x.get("lessonPair", {}).get("code", "")))
-    
-    # Group by day
-    schedule_by_day = defaultdict(list)
+    schedule.sort(key=lambda x: (x.get("lesson_date") or 0, (x.get("lessonPair") or EMPTY_MAPPING).get("code", "")))
     
-    for lesson in schedule:
-        if lesson.get("lesson_date"):
-            day = datetime.fromtimestamp(lesson["lesson_date"]).strftime('%Y-%m-%d')
-            schedule_by_day[day].append(lesson)
+    # Lessons without a date can't be placed on a day
+    dated_lessons = [lesson for lesson in schedule if lesson.get("lesson_date")]
     
     # Get week information if available
     if schedule and schedule[0].get("weekStartTime") and schedule[0].get("weekEndTime"):
-        week_start = datetime.fromtimestamp(schedule[0]["weekStartTime"]).strftime('%Y-%m-%d')
-        week_end = datetime.fromtimestamp(schedule[0]["weekEndTime"]).strftime('%Y-%m-%d')
+        week_start = format_date(schedule[0]["weekStartTime"])
+        week_end = format_date(schedule[0]["weekEndTime"])
         result.append(f"\nWeek: **{week_start}** to **{week_end}**")
     
-    # Display schedule for each day
-    for day, lessons in schedule_by_day.items():
-        day_name = datetime.strptime(day, '%Y-%m-%d').strftime('%A')
-        result.append(f"\n## {day_name} ({day})")
+    # The sort keeps each day's lessons contiguous, so they can be grouped as they stream past
+    for day, lessons in groupby(dated_lessons, key=lesson_day):
+        result.append(f"\n## {day.strftime('%A (%Y-%m-%d)')}")
         
         for lesson in lessons:
-            subject_info = lesson.get("subject", {})
+            subject_info = lesson.get("subject") or EMPTY_MAPPING
             subject_name = subject_info.get("name", "Unknown Subject")
             subject_code = subject_info.get("code", "")
             
-            lesson_pair = lesson.get("lessonPair", {})
+            lesson_pair = lesson.get("lessonPair") or EMPTY_MAPPING
             start_time = lesson_pair.get("start_time", "")
             end_time = lesson_pair.get("end_time", "")
             time_info = f"{start_time}-{end_time}" if start_time and end_time else "Time not specified"
             
-            training_type = lesson.get("trainingType", {}).get("name", "Unknown Type")
+            training_type = (lesson.get("trainingType") or EMPTY_MAPPING).get("name", "Unknown Type")
             
-            employee = lesson.get("employee", {}).get("name", "Not specified")
+            employee = (lesson.get("employee") or EMPTY_MAPPING).get("name", "Not specified")
             
-            auditorium = lesson.get("auditorium", {})
+            auditorium = lesson.get("auditorium") or EMPTY_MAPPING
             room = auditorium.get("name", "Not specified")
-            building = auditorium.get("building", {}).get("name", "")
+            building = (auditorium.get("building") or EMPTY_MAPPING).get("name", "")
             location = f"{room}, {building}" if building else room
             
-            result.append(f"\n### {time_info} - {subject_name} ({subject_code})")
-            result.append(f"- **Type:** {training_type}")
-            result.append(f"- **Instructor:** {employee}")
-            result.append(f"- **Location:** {location}")
+            result.append(
+                f"\n### {time_info} - {subject_name} ({subject_code})\n"
+                f"- **Type:** {training_type}\n"
+                f"- **Instructor:** {employee}\n"
+                f"- **Location:** {location}"
+            )
             
-            group = lesson.get("group", {}).get("name", "")
+            group = (lesson.get("group") or EMPTY_MAPPING).get("name", "")
             if group:
                 result.append(f"- **Group:** {group}")
     
-    if not schedule_by_day:
+    if not dated_lessons:
         result.append("\nNo scheduled classes found for this period.")
     
     return "\n".join(result)
@@ -1291,20 +1417,10 @@ async def get_subject_details(subject: str | int, semester: str | int, language:
         semester: Semester code to get subjects for (e.g. "14" for 4th semester")
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    token = await login_to_hemis()
-    
-    if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
-    
     endpoint = "education/subject"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}&semester={semester}&subject={subject}"
-    
-    data = await make_get_request(url, token)
-    
-    if not data or not data.get("success"):
-        return "Unable to fetch subject details for the specified subject and semester."
+    params = {"l": language, "semester": semester, "subject": subject}
     
-    subject_data = data["data"]
+    subject_data = await fetch_student_data(endpoint, params, "Unable to fetch subject details for the specified subject and semester.")
     
     if not subject_data:
         return "No details found for this subject in the specified semester."
@@ -1312,7 +1428,7 @@ async def get_subject_details(subject: str | int, semester: str | int, language:
     result = []
     
     # Basic subject information
-    subject_info = subject_data.get("subject", {})
+    subject_info = subject_data.get("subject") or EMPTY_MAPPING
     subject_name = subject_info.get("name", "Unknown Subject")
     subject_code = subject_info.get("code", "")
     subject_id = subject_info.get("id", "")
@@ -1322,7 +1438,7 @@ async def get_subject_details(subject: str | int, semester: str | int, language:
     result.append(f"- Subject ID: {subject_id}")
     
     # Subject type information
-    subject_type = subject_data.get("subjectType", {})
+    subject_type = subject_data.get("subjectType") or EMPTY_MAPPING
     subject_type_name = subject_type.get("name", "Unknown Type")
     subject_type_code = subject_type.get("code", "")
     result.append(f"- Type: {subject_type_name} ({subject_type_code})")
@@ -1379,14 +1495,13 @@ async def get_subject_details(subject: str | int, semester: str | int, language:
             task_name = task.get("name", "Unnamed Task")
             result.append(f"\n### {task_name}")
             
-            task_type = task.get("taskType", {}).get("name", "")
+            task_type = (task.get("taskType") or EMPTY_MAPPING).get("name", "")
             if task_type:
                 result.append(f"- Type: {task_type}")
                 
             deadline = task.get("deadline")
             if deadline:
-                from datetime import datetime
-                deadline_date = datetime.fromtimestamp(deadline).strftime('%Y-%m-%d %H:%M')
+                deadline_date = format_datetime(deadline)
                 result.append(f"- Deadline: {deadline_date}")
                 
             max_ball = task.get("max_ball")
@@ -1401,7 +1516,7 @@ async def get_subject_details(subject: str | int, semester: str | int, language:
                     percentage = (grade / max_ball) * 100
                     result.append(f"- Percentage: {percentage:.2f}%")
                     
-            status = task.get("taskStatus", {}).get("name", "")
+            status = (task.get("taskStatus") or EMPTY_MAPPING).get("name", "")
             if status:
                 result.append(f"- Status: {status}")
     else:
@@ -1409,6 +1524,38 @@ async def get_subject_details(subject: str | int, semester: str | int, language:
     
     return "\n".join(result)
 
+TASK_TEMPLATE = (
+    "\n## {name}{comment_line}{training_type_line}{task_type_line}{max_ball_line}"
+    "{deadline_line}{attempt_limit_line}{status_line}{employee_line}{updated_line}"
+)
+
+def format_task(task: dict[str, Any]) -> str:
+    """Render one education/task-list entry, without its attached files."""
+    training_type = (task.get("trainingType") or EMPTY_MAPPING).get("name", "")
+    task_type = (task.get("taskType") or EMPTY_MAPPING).get("name", "")
+    task_status = (task.get("taskStatus") or EMPTY_MAPPING).get("name", "")
+    employee = (task.get("employee") or EMPTY_MAPPING).get("name", "")
+    max_ball = task.get("max_ball")
+    deadline = task.get("deadline")
+    attempt_limit = task.get("attempt_limit")
+    updated_at = task.get("updated_at")
+    
+    # Absent fields render as empty strings, so the template needs no branching
+    view = {
+        "name": task.get("name", "Unnamed Task"),
+        "comment_line": f"\n\n{task['comment']}" if task.get("comment") else "",
+        "training_type_line": f"\n\n- **Training Type:** {training_type}" if training_type else "",
+        "task_type_line": f"\n- **Task Type:** {task_type}" if task_type else "",
+        "max_ball_line": f"\n- **Maximum Score:** {max_ball}" if max_ball is not None else "",
+        "deadline_line": f"\n- **Deadline:** {format_datetime(deadline)}" if deadline else "",
+        "attempt_limit_line": f"\n- **Attempt Limit:** {attempt_limit}" if attempt_limit else "",
+        "status_line": f"\n- **Status:** {task_status}" if task_status else "",
+        "employee_line": f"\n- **Instructor:** {employee}" if employee else "",
+        "updated_line": f"\n- **Last Updated:** {format_datetime(updated_at)}" if updated_at else "",
+    }
+    
+    return TASK_TEMPLATE.format_map(view)
+
 @mcp.tool()
 async def get_student_task_list(semester: str | int, page: int = 0, limit: int = 10, language: str = "en-US") -> str:
     """Get your list of tasks/assignments for a specific semester from HEMIS.
@@ -1419,20 +1566,11 @@ async def get_student_task_list(semester: str | int, page: int = 0, limit: int =
         limit: Number of tasks per page (default: 10)
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    token = await login_to_hemis()
-    
-    if not token:
-        return "Unable to authenticate with HEMIS. Please check your credentials."
-    
     endpoint = "education/task-list"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}&page={page}&limit={limit}&semester={semester}"
+    params = {"l": language, "page": page, "limit": limit, "semester": semester}
     
-    data = await make_get_request(url, token)
+    tasks = await fetch_student_data(endpoint, params, "Unable to fetch tasks list for the specified semester.")
     
-    if not data or not data.get("success"):
-        return "Unable to fetch tasks list for the specified semester."
-    
-    tasks = data["data"]
     result = [f"# Tasks List for Semester {semester}"]
     
     if not tasks:
@@ -1442,48 +1580,10 @@ async def get_student_task_list(semester: str | int, page: int = 0, limit: int =
     # Sort tasks by deadline if available
     tasks.sort(key=lambda x: x.get("deadline", 0) or float('inf'))
     
-    for task in tasks:
-        task_name = task.get("name", "Unnamed Task")
-        result.append(f"\n## {task_name}")
-        
-        if task.get("comment"):
-            result.append(f"\n{task['comment']}")
-        
-        # Task details
-        training_type = task.get("trainingType", {}).get("name", "")
-        if training_type:
-            result.append(f"\n- **Training Type:** {training_type}")
-        
-        task_type = task.get("taskType", {}).get("name", "")
-        if task_type:
-            result.append(f"- **Task Type:** {task_type}")
-        
-        max_ball = task.get("max_ball")
-        if max_ball is not None:
-            result.append(f"- **Maximum Score:** {max_ball}")
-        
-        deadline = task.get("deadline")
-        if deadline:
-            from datetime import datetime
-            deadline_date = datetime.fromtimestamp(deadline).strftime('%Y-%m-%d %H:%M')
-            result.append(f"- **Deadline:** {deadline_date}")
-        
-        attempt_limit = task.get("attempt_limit")
-        if attempt_limit:
-            result.append(f"- **Attempt Limit:** {attempt_limit}")
-        
-        task_status = task.get("taskStatus", {}).get("name", "")
-        if task_status:
-            result.append(f"- **Status:** {task_status}")
-        
-        employee = task.get("employee", {}).get("name", "")
-        if employee:
-            result.append(f"- **Instructor:** {employee}")
-        
-        if task.get("updated_at"):
-            from datetime import datetime
-            update_date = datetime.fromtimestamp(task["updated_at"]).strftime('%Y-%m-%d %H:%M')
-            result.append(f"- **Last Updated:** {update_date}")
+    output_len = 0
+    for shown, task in enumerate(tasks, 1):
+        row_start = len(result)
+        result.append(format_task(task))
         
         # Attached files
         files = task.get("files", [])
@@ -1494,25 +1594,138 @@ async def get_student_task_list(semester: str | int, page: int = 0, limit: int =
                 file_size = file.get("size", 0)
                 file_url = file.get("url", "")
                 
-                size_display = f"{file_size} bytes"
-                if file_size > 1024 * 1024:
-                    size_display = f"{file_size / (1024 * 1024):.2f} MB"
-                elif file_size > 1024:
-                    size_display = f"{file_size / 1024:.2f} KB"
+                size_display = format_file_size(file_size)
                     
                 if file_url:
                     result.append(f"- [{file_name}]({file_url}) ({size_display})")
                 else:
                     result.append(f"- {file_name} ({size_display})")
+        
+        output_len += sum(map(len, result[row_start:]))
+        if output_len > MAX_OUTPUT_CHARS and shown < len(tasks):
+            result.append(f"\n*Output truncated after {shown} of {len(tasks)} tasks; use a smaller limit to see the rest.*")
+            break
     
-    # Add pagination information
-    result.append(f"\n---\n**Page {page+1}** (showing {len(tasks)} tasks)")
+    # Add pagination information; `shown` counts only the tasks rendered before any truncation
+    result.append(f"\n---\n**Page {page+1}** (showing {shown} tasks)")
     result.append(f"To see more tasks, use page={page+1}")
     
     return "\n".join(result)
 
 # ----------------------------- public -----------------------------------------
 
+# (endpoint, language) -> (stored_at, rendered markdown); public data is the same for every user
+_public_render_cache: OrderedDict[tuple[str, str], tuple[float, str]] = OrderedDict()
+
+async def render_public_data(
+    endpoint: str,
+    language: str,
+    formatter: Callable[[Any], str],
+    error_message: str
+) -> str:
+    """Fetch a public endpoint and render it, reusing the rendered markdown while it is fresh."""
+    key = (endpoint, language)
+    cached = _public_render_cache.get(key)
+    if cached and time.monotonic() - cached[0] < PUBLIC_CACHE_TTL:
+        return cached[1]
+    
+    data = await make_get_request(endpoint, params={"l": language}, cache_ttl=PUBLIC_CACHE_TTL)
+    
+    if not data or not data.get("success"):
+        raise ToolError(error_message)
+    
+    result = formatter(data["data"])
+    
+    _public_render_cache[key] = (time.monotonic(), result)
+    _public_render_cache.move_to_end(key)
+    if len(_public_render_cache) > GET_CACHE_SIZE:
+        _public_render_cache.popitem(last=False)
+    
+    return result
+
+# Row renderers for the public statistics trees; each appends one section's lines to `lines`
+
+def append_counts(lines: list[str], counts: dict[str, Any]) -> None:
+    lines.extend([f"- {label}: {count}" for label, count in counts.items()])
+
+def append_gender_breakdown(lines: list[str], counts: dict[str, dict[str, Any]]) -> None:
+    for label, gender_counts in counts.items():
+        if not gender_counts:
+            continue
+        lines.append(f"- {label}:")
+        lines.extend([f"  - {gender}: {count}" for gender, count in gender_counts.items()])
+
+def append_nested_counts(lines: list[str], counts: dict[str, Any], depth: int = 3) -> None:
+    """Append nested {label: {...: count}} mappings as headings, down to "- label: count" rows."""
+    for label, value in counts.items():
+        if isinstance(value, dict):
+            child_lines = []
+            append_nested_counts(child_lines, value, depth + 1)
+            # Subtrees without any counts would only leave an orphan heading
+            if child_lines:
+                lines.append(f"{'#' * depth} {label}")
+                lines.extend(child_lines)
+        else:
+            lines.append(f"- {label}: {value}")
+
+def append_named_counts(lines: list[str], items: list[dict[str, Any]]) -> None:
+    lines.extend([f"- {item['name']}: {item['count']}" for item in items])
+
+def append_group_counts(lines: list[str], groups: dict[str, dict[str, Any]]) -> None:
+    for degree_type, courses in groups.items():
+        if not courses:
+            continue
+        lines.append(f"### {degree_type}")
+        lines.extend([f"- {course}: {count} groups" for course, count in courses.items()])
+
+def append_student_levels(lines: list[str], levels: dict[str, dict[str, dict[str, Any]]]) -> None:
+    for edu_level, courses in levels.items():
+        level_lines = []
+        for course, forms in courses.items():
+            # Only show forms with students, and only courses that have any
+            rows = [f"- {form}: {count}" for form, count in forms.items() if count > 0]
+            if rows:
+                level_lines.append(f"#### {course}")
+                level_lines.extend(rows)
+        
+        if level_lines:
+            lines.append(f"### {edu_level}")
+            lines.extend(level_lines)
+
+def format_stat_sections(
+    stats: dict[str, Any],
+    sections: tuple[tuple[str, str, Callable[[list[str], Any], None]], ...]
+) -> str:
+    """Render (stats key, heading, row renderer) sections as markdown separated by blank lines."""
+    rendered = []
+    for key, heading, append_rows in sections:
+        # Sparse payloads can omit or empty a section; skip it instead of failing the whole tool
+        section = stats.get(key)
+        if not section:
+            continue
+        
+        lines = [f"## {heading}"]
+        append_rows(lines, section)
+        rendered.append("\n".join(lines))
+    
+    return "\n\n".join(rendered)
+
+EMPLOYEE_STAT_SECTIONS = (
+    ("position", "Position Statistics", append_counts),
+    ("gender", "Gender Statistics", append_counts),
+    ("citizenship", "Citizenship Statistics", append_counts),
+    ("academic_degree", "Academic Degree Statistics", append_gender_breakdown),
+    ("academic_rank", "Academic Rank Statistics", append_gender_breakdown),
+    ("direction", "Direction Statistics", append_counts),
+    ("academic", "Academic Status", append_counts),
+    ("age", "Age Statistics", append_gender_breakdown),
+    ("employment_form", "Employment Form Statistics", append_counts),
+)
+
+def format_employee_statistics(stats: dict[str, Any]) -> str:
+    """Render the public/stat-employee payload as markdown."""
+    return format_stat_sections(stats, EMPLOYEE_STAT_SECTIONS)
+
 @mcp.tool()
 async def get_employee_statistics(language: str = "en-US") -> str:
     """Get statistics about university employees.
@@ -1520,60 +1733,18 @@ async def get_employee_statistics(language: str = "en-US") -> str:
     Args:
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    endpoint = "public/stat-employee"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}"
-    data = await make_get_request(url)
-    
-    if not data or not data.get("success"):
-        return "Unable to fetch employee statistics."
-    
-    stats = data["data"]
-    
-    result = []
-    
-    result.append("## Position Statistics")
-    for position, count in stats["position"].items():
-        result.append(f"- {position}: {count}")
-    
-    result.append("\n## Gender Statistics")
-    for gender, count in stats["gender"].items():
-        result.append(f"- {gender}: {count}")
-    
-    result.append("\n## Citizenship Statistics")
-    for citizenship, count in stats["citizenship"].items():
-        result.append(f"- {citizenship}: {count}")
-    
-    result.append("\n## Academic Degree Statistics")
-    for degree, gender_counts in stats["academic_degree"].items():
-        result.append(f"- {degree}:")
-        for gender, count in gender_counts.items():
-            result.append(f"  - {gender}: {count}")
-    
-    result.append("\n## Academic Rank Statistics")
-    for rank, gender_counts in stats["academic_rank"].items():
-        result.append(f"- {rank}:")
-        for gender, count in gender_counts.items():
-            result.append(f"  - {gender}: {count}")
-    
-    result.append("\n## Direction Statistics")
-    for direction, count in stats["direction"].items():
-        result.append(f"- {direction}: {count}")
-    
-    result.append("\n## Academic Status")
-    for status, count in stats["academic"].items():
-        result.append(f"- {status}: {count}")
-    
-    result.append("\n## Age Statistics")
-    for age_group, gender_counts in stats["age"].items():
-        result.append(f"- {age_group}:")
-        for gender, count in gender_counts.items():
-            result.append(f"  - {gender}: {count}")
-    
-    result.append("\n## Employment Form Statistics")
-    for form, count in stats["employment_form"].items():
-        result.append(f"- {form}: {count}")
+    return await render_public_data("public/stat-employee", language, format_employee_statistics, "Unable to fetch employee statistics.")
 
-    return "\n".join(result)
+STRUCTURE_STAT_SECTIONS = (
+    ("groups", "Student Groups Statistics", append_group_counts),
+    ("auditoriums", "Auditorium Statistics", append_named_counts),
+    ("specialities", "Specialties Statistics", append_named_counts),
+    ("departments", "Department Statistics", append_named_counts),
+)
+
+def format_university_structure(stats: dict[str, Any]) -> str:
+    """Render the public/stat-structure payload as markdown."""
+    return format_stat_sections(stats, STRUCTURE_STAT_SECTIONS)
 
 @mcp.tool()
 async def get_university_structure(language: str = "en-US") -> str:
@@ -1582,35 +1753,22 @@ async def get_university_structure(language: str = "en-US") -> str:
     Args:
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    endpoint = "public/stat-structure"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}"
-    data = await make_get_request(url)
-    
-    if not data or not data.get("success"):
-        return "Unable to fetch university structure statistics."
-    
-    stats = data["data"]
-    result = []
-    
-    result.append("## Student Groups Statistics")
-    for degree_type, courses in stats["groups"].items():
-        result.append(f"### {degree_type}")
-        for course, count in courses.items():
-            result.append(f"- {course}: {count} groups")
-    
-    result.append("\n## Auditorium Statistics")
-    for item in stats["auditoriums"]:
-        result.append(f"- {item['name']}: {item['count']}")
-    
-    result.append("\n## Specialties Statistics")
-    for item in stats["specialities"]:
-        result.append(f"- {item['name']}: {item['count']}")
-    
-    result.append("\n## Department Statistics")
-    for item in stats["departments"]:
-        result.append(f"- {item['name']}: {item['count']}")
-    
-    return "\n".join(result)
+    return await render_public_data("public/stat-structure", language, format_university_structure, "Unable to fetch university structure statistics.")
+
+STUDENT_STAT_SECTIONS = (
+    ("education_type", "Education Type Statistics", append_nested_counts),
+    ("age", "Age Statistics", append_nested_counts),
+    ("payment", "Payment Type Statistics", append_nested_counts),
+    ("region", "Regional Statistics", append_nested_counts),
+    ("citizenship", "Citizenship Statistics", append_nested_counts),
+    ("accommodation", "Accommodation Statistics", append_nested_counts),
+    ("education_form", "Education Form Statistics", append_nested_counts),
+    ("level", "Student Level Statistics", append_student_levels),
+)
+
+def format_student_statistics(stats: dict[str, Any]) -> str:
+    """Render the public/stat-student payload as markdown."""
+    return format_stat_sections(stats, STUDENT_STAT_SECTIONS)
 
 @mcp.tool()
 async def get_student_statistics(language: str = "en-US") -> str:
@@ -1619,70 +1777,16 @@ async def get_student_statistics(language: str = "en-US") -> str:
     Args:
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    endpoint = "public/stat-student"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}"
-    data = await make_get_request(url)
-    
-    if not data or not data.get("success"):
-        return "Unable to fetch student statistics."
-    
-    stats = data["data"]
-    result = []
+    return await render_public_data("public/stat-student", language, format_student_statistics, "Unable to fetch student statistics.")
+
+def format_universities(universities: list[dict[str, Any]]) -> str:
+    """Render the public/universities payload as markdown."""
+    result = ["# Universities using HEMIS system"]
     
-    result.append("## Education Type Statistics")
-    for edu_type, gender_counts in stats["education_type"].items():
-        result.append(f"### {edu_type}")
-        for gender, count in gender_counts.items():
-            result.append(f"- {gender}: {count}")
-    
-    result.append("\n## Age Statistics")
-    for edu_level, age_groups in stats["age"].items():
-        result.append(f"### {edu_level}")
-        for age_group, gender_counts in age_groups.items():
-            result.append(f"#### {age_group}")
-            for gender, count in gender_counts.items():
-                result.append(f"- {gender}: {count}")
-    
-    result.append("\n## Payment Type Statistics")
-    for payment_type, edu_counts in stats["payment"].items():
-        result.append(f"### {payment_type}")
-        for edu_level, count in edu_counts.items():
-            result.append(f"- {edu_level}: {count}")
-    
-    result.append("\n## Regional Statistics")
-    for region, edu_counts in stats["region"].items():
-        result.append(f"### {region}")
-        for edu_level, count in edu_counts.items():
-            result.append(f"- {edu_level}: {count}")
-    
-    result.append("\n## Citizenship Statistics")
-    for citizenship, edu_counts in stats["citizenship"].items():
-        result.append(f"### {citizenship}")
-        for edu_level, count in edu_counts.items():
-            result.append(f"- {edu_level}: {count}")
-    
-    result.append("\n## Accommodation Statistics")
-    for accommodation, edu_counts in stats["accommodation"].items():
-        result.append(f"### {accommodation}")
-        for edu_level, count in edu_counts.items():
-            result.append(f"- {edu_level}: {count}")
-    
-    result.append("\n## Education Form Statistics")
-    for edu_level, forms in stats["education_form"].items():
-        result.append(f"### {edu_level}")
-        for form, gender_counts in forms.items():
-            result.append(f"#### {form}")
-            for gender, count in gender_counts.items():
-                result.append(f"- {gender}: {count}")
-    
-    result.append("\n## Student Level Statistics")
-    for edu_level, courses in stats["level"].items():
-        result.append(f"### {edu_level}")
-        for course, forms in courses.items():
-            result.append(f"#### {course}")
-            for form, count in forms.items():
-                if count > 0:  # Only show forms with students
-                    result.append(f"- {form}: {count}")
+    result.extend([
+        f"\n## {university['name']}\n- University Type: {university['university_type']}"
+        for university in universities
+    ])
     
     return "\n".join(result)
 
@@ -1693,37 +1797,10 @@ async def get_universities(language: str = "en-US") -> str:
     Args:
         language: Language for the response (e.g. en-US, uz-UZ)
     """
-    endpoint = "public/universities"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}"
-    data = await make_get_request(url)
-    
-    if not data or not data.get("success"):
-        return "Unable to fetch universities list."
-    
-    universities = data["data"]
-    result = ["# Universities using HEMIS system"]
-    
-    for university in universities:
-        result.append(f"\n## {university['name']}")
-        result.append(f"- University Type: {university['university_type']}")
-    
-    return "\n".join(result)
+    return await render_public_data("public/universities", language, format_universities, "Unable to fetch universities list.")
 
-@mcp.tool()
-async def get_university_profile(language: str = "en-US") -> str:
-    """Get profile information about university.
-    
-    Args:
-        language: Language for the response (e.g. en-US, uz-UZ)
-    """
-    endpoint = "public/university-profile"
-    url = f"{HEMIS_API_BASE}{endpoint}?l={language}"
-    data = await make_get_request(url)
-    
-    if not data or not data.get("success"):
-        return "Unable to fetch university profile information."
-    
-    profile = data["data"]
+def format_university_profile(profile: dict[str, Any]) -> str:
+    """Render the public/university-profile payload as markdown."""
     result = []
     
     result.append(f"# {profile['name']}")
@@ -1739,6 +1816,48 @@ async def get_university_profile(language: str = "en-US") -> str:
     
     return "\n".join(result)
 
+@mcp.tool()
+async def get_university_profile(language: str = "en-US") -> str:
+    """Get profile information about university.
+    
+    Args:
+        language: Language for the response (e.g. en-US, uz-UZ)
+    """
+    return await render_public_data("public/university-profile", language, format_university_profile, "Unable to fetch university profile information.")
+
+
+@mcp.tool()
+async def get_university_overview(language: str = "en-US") -> str:
+    """Get the university profile, structure, student and employee statistics and the HEMIS university list in a single call.
+    
+    Args:
+        language: Language for the response (e.g. en-US, uz-UZ)
+    """
+    sections = [
+        ("public/university-profile", format_university_profile, "Unable to fetch university profile information."),
+        ("public/stat-structure", format_university_structure, "Unable to fetch university structure statistics."),
+        ("public/stat-student", format_student_statistics, "Unable to fetch student statistics."),
+        ("public/stat-employee", format_employee_statistics, "Unable to fetch employee statistics."),
+        ("public/universities", format_universities, "Unable to fetch universities list."),
+    ]
+    
+    # The public endpoints are independent, so fetch them concurrently
+    rendered = await asyncio.gather(
+        *(render_public_data(endpoint, language, formatter, error_message) for endpoint, formatter, error_message in sections),
+        return_exceptions=True
+    )
+    
+    result = "\n\n".join(
+        error_message if isinstance(section, BaseException) else section
+        for (_, _, error_message), section in zip(sections, rendered)
+    )
+    
+    # A partial overview is still an error, so clients don't reuse it; the loaded sections stay in the message
+    if any(isinstance(section, BaseException) for section in rendered):
+        raise ToolError(result)
+    
+    return result
+
 
 if __name__ == "__main__":
-    mcp.run(transport='stdio')
\ No newline at end of file
+    mcp.run(transport='stdio')